@@ -1,6 +1,20 @@
 """CSV Importer package."""
 
-from .importer import CSVImporter
-from .processors import validate_customer_file, CompanyProcessor
+import importlib
+
+# Public names and the submodules that define them. They are imported on
+# first access so that lightweight entry points (e.g. `importer --help`)
+# do not pay for pandas and the processors.
+_LAZY_EXPORTS = {
+    'CSVImporter': '.importer',
+    'validate_customer_file': '.processors',
+    'CompanyProcessor': '.processors',
+}
 
 __all__ = ['CSVImporter', 'validate_customer_file', 'CompanyProcessor']
+
+def __getattr__(name: str):
+    """Import public names lazily on first access."""
+    if name in _LAZY_EXPORTS:
+        return getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
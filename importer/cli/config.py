@@ -5,6 +5,7 @@ Handles loading and validating configuration from environment variables and file
 
 import os
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Optional
 from pathlib import Path
 from dotenv import load_dotenv
@@ -39,6 +40,24 @@ class Config:
     def from_env(cls, env_file: Optional[Path] = None) -> 'Config':
         """Create configuration from environment variables.
         
+        The result is cached per env_file, so every command in a process
+        shares one instance instead of re-reading the environment.
+        
+        Args:
+            env_file: Optional path to .env file
+            
+        Returns:
+            Config: Configuration instance
+            
+        Raises:
+            ValueError: If required environment variables are missing
+        """
+        return _cached_from_env(cls, env_file)
+    
+    @classmethod
+    def _from_env_uncached(cls, env_file: Optional[Path] = None) -> 'Config':
+        """Create configuration from environment variables without caching.
+        
         Args:
             env_file: Optional path to .env file
             
@@ -97,3 +116,8 @@ class Config:
             raise ValueError(f"output_format must be one of: {', '.join(valid_formats)}")
             
         return True
+
+@lru_cache(maxsize=None)
+def _cached_from_env(config_cls: type, env_file: Optional[Path]) -> Config:
+    """Load configuration once per (class, env_file) pair."""
+    return config_cls._from_env_uncached(env_file)
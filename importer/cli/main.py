@@ -2,26 +2,59 @@
 Core CLI implementation for the importer package.
 """
 
+import importlib
+from typing import Dict, List, Optional
+
 import click
 from pathlib import Path
 
 from .config import Config
 from .logging import setup_logging, get_logger
-from ..commands.validate import ValidateCustomersCommand, ValidateSalesCommand
-from ..commands.utils import TestConnectionCommand
-from ..commands.sales import sales, process_invoices, process_receipts, import_products
-from ..commands.verify import VerifyCommand
-from ..commands.customers import (
-    ListCompaniesCommand,
-    ExtractDomainsCommand,
-    ProcessAddressesCommand,
-    ProcessCustomersCommand,
-    ProcessEmailsCommand,
-    ProcessPhonesCommand,
-    VerifyImportCommand
-)
-
-@click.group()
+
+class LazyGroup(click.Group):
+    """Click group that imports some subcommands only when they are used.
+    
+    Command modules pull in pandas, SQLAlchemy and the processors, so they
+    are imported on demand rather than when the CLI starts.
+    """
+    
+    def __init__(self, *args, lazy_subcommands: Optional[Dict[str, str]] = None, **kwargs):
+        """Initialize the group.
+        
+        Args:
+            lazy_subcommands: Map of command name to "module:attribute" import path
+        """
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands or {}
+    
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        """List eager and lazy command names."""
+        return sorted([*super().list_commands(ctx), *self.lazy_subcommands])
+    
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        """Get a command, importing it first if it is lazy."""
+        if cmd_name in self.lazy_subcommands:
+            return self._load_command(cmd_name)
+        return super().get_command(ctx, cmd_name)
+    
+    def _load_command(self, cmd_name: str) -> click.Command:
+        """Import a lazy command from its "module:attribute" path."""
+        module_name, attr_path = self.lazy_subcommands[cmd_name].split(':')
+        command = importlib.import_module(module_name)
+        for attr in attr_path.split('.'):
+            command = getattr(command, attr)
+        return command
+
+@click.group(cls=LazyGroup, lazy_subcommands={
+    # Top-level process commands
+    'process-invoices': 'importer.commands.sales.process_invoices:process_invoices',
+    'process-receipts': 'importer.commands.sales.process_receipts:process_receipts',
+    'import-products': 'importer.commands.sales.import_products:import_products',
+    # Sales commands (specialized operations)
+    'sales': 'importer.commands.sales:sales',
+    # Verify commands
+    'verify': 'importer.commands.verify:VerifyCommand.verify',
+})
 @click.option('--debug', is_flag=True, help='Enable detailed debug output')
 @click.pass_context
 def cli(ctx, debug: bool):
@@ -53,6 +86,7 @@ def test_connection():
     """Test database connectivity"""
     try:
         config = Config.from_env()
+        from ..commands.utils import TestConnectionCommand
         command = TestConnectionCommand(config)
         command.execute()
     except Exception as e:
@@ -67,6 +101,7 @@ def validate(file: Path, output: Path | None):
     try:
         # Initialize and run command
         config = Config.from_env()
+        from ..commands.validate import ValidateCustomersCommand
         command = ValidateCustomersCommand(config, file, output)
         command.execute()
     except Exception as e:
@@ -81,6 +116,7 @@ def validate_sales(file: Path, output: Path | None):
     try:
         # Initialize and run command
         config = Config.from_env()
+        from ..commands.validate import ValidateSalesCommand
         command = ValidateSalesCommand(config, file, output)
         command.execute()
     except Exception as e:
@@ -99,6 +135,7 @@ def list_companies(limit: int):
     """List most recent companies in the database."""
     try:
         config = Config.from_env()
+        from ..commands.customers import ListCompaniesCommand
         command = ListCompaniesCommand(config, limit)
         command.execute()
     except Exception as e:
@@ -112,6 +149,7 @@ def extract_domains(file: Path, output: Path | None):
     """Extract and analyze email domains from a customer CSV file."""
     try:
         config = Config.from_env()
+        from ..commands.customers import ExtractDomainsCommand
         command = ExtractDomainsCommand(config, file, output)
         command.execute()
     except Exception as e:
@@ -125,6 +163,7 @@ def process_addresses(file: Path, output: Path | None):
     """Process and deduplicate addresses from a customer CSV file."""
     try:
         config = Config.from_env()
+        from ..commands.customers import ProcessAddressesCommand
         command = ProcessAddressesCommand(config, file, output)
         command.execute()
     except Exception as e:
@@ -139,6 +178,7 @@ def process_customers(ctx, file: Path, output: Path | None):
     """Process customer records from a CSV file."""
     try:
         config = Config.from_env()
+        from ..commands.customers import ProcessCustomersCommand
         command = ProcessCustomersCommand(config, file, output)
         command.execute()
     except Exception as e:
@@ -152,6 +192,7 @@ def process_emails(file: Path, output: Path | None):
     """Process and store customer email information from a CSV file."""
     try:
         config = Config.from_env()
+        from ..commands.customers import ProcessEmailsCommand
         command = ProcessEmailsCommand(config, file, output)
         command.execute()
     except Exception as e:
@@ -165,6 +206,7 @@ def process_phones(file: Path, output: Path | None):
     """Process and store customer phone information from a CSV file."""
     try:
         config = Config.from_env()
+        from ..commands.customers import ProcessPhonesCommand
         command = ProcessPhonesCommand(config, file, output)
         command.execute()
     except Exception as e:
@@ -177,21 +219,9 @@ def verify_import(output: Path | None):
     """Verify data integrity after import process."""
     try:
         config = Config.from_env()
+        from ..commands.customers import VerifyImportCommand
         command = VerifyImportCommand(config, output)
         command.execute()
     except Exception as e:
         click.secho(f"Error: {str(e)}", fg='red')
         raise click.Abort()
-
-# Register top-level process commands
-cli.add_command(process_invoices)
-cli.add_command(process_receipts)
-cli.add_command(import_products)
-
-# Register sales commands (specialized operations)
-cli.add_command(sales)
-
-# Register verify commands
-verify_command = VerifyCommand()
-for command in verify_command.commands:
-    cli.add_command(command)
@@ -3,7 +3,18 @@ Command implementations for the importer CLI.
 Each submodule provides specific command functionality.
 """
 
-from .validate import ValidateCustomersCommand
-from .utils import TestConnectionCommand
+import importlib
+
+# Command classes and their modules
+_LAZY_EXPORTS = {
+    'ValidateCustomersCommand': '.validate',
+    'TestConnectionCommand': '.utils',
+}
 
 __all__ = ['ValidateCustomersCommand', 'TestConnectionCommand']
+
+def __getattr__(name: str):
+    """Import public names lazily on first access."""
+    if name in _LAZY_EXPORTS:
+        return getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
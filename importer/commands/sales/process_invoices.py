@@ -32,7 +32,7 @@ from ...db.session import SessionManager
 class ProcessInvoicesCommand(FileInputCommand):
     """Command to process invoices from a sales data file."""
     
-    def __init__(self, config, input_file: Path, output_file: Optional[Path] = None, batch_size: int = 100, error_limit: int = 1000):
+    def __init__(self, config, input_file: Path, output_file: Optional[Path] = None, batch_size: int = 100, error_limit: int = 1000, skip_validation: bool = False):
         """Initialize the command.
         
         Args:
@@ -41,10 +41,12 @@ class ProcessInvoicesCommand(FileInputCommand):
             output_file: Optional path to save results
             batch_size: Number of records to process per batch
             error_limit: Maximum number of errors before stopping
+            skip_validation: Skip product validation rules for trusted input
         """
         super().__init__(config, input_file, output_file)
         self.batch_size = batch_size
         self.error_limit = error_limit
+        self.skip_validation = skip_validation
         self.logger = get_logger(__name__)
     
     @command_error_handler
@@ -192,7 +194,8 @@ class ProcessInvoicesCommand(FileInputCommand):
                     config=config_dict,
                     batch_size=self.batch_size,
                     error_limit=self.error_limit,
-                    debug=self.debug
+                    debug=self.debug,
+                    skip_validation=self.skip_validation
                 )
                 
                 # Process products
@@ -285,9 +288,10 @@ class ProcessInvoicesCommand(FileInputCommand):
 @click.option('--output', type=click.Path(file_okay=True, dir_okay=False, path_type=Path), help='Save processing results to file')
 @click.option('--batch-size', default=100, help='Number of records to process per batch')
 @click.option('--error-limit', default=1000, help='Maximum number of errors before stopping')
+@click.option('--skip-validation', is_flag=True, help='Skip product validation rules for trusted files')
 @click.option('--debug', is_flag=True, help='Enable debug logging')
 @click.pass_context
-def process_invoices(ctx, file_path: Path, output: Optional[Path], batch_size: int, error_limit: int, debug: bool):
+def process_invoices(ctx, file_path: Path, output: Optional[Path], batch_size: int, error_limit: int, skip_validation: bool, debug: bool):
     """Import invoice data from a CSV file into the database."""
     config = ctx.obj.get('config')
     if not config:
@@ -295,6 +299,6 @@ def process_invoices(ctx, file_path: Path, output: Optional[Path], batch_size: i
         logger.error("No configuration found in context")
         return
         
-    command = ProcessInvoicesCommand(config, file_path, output, batch_size, error_limit)
+    command = ProcessInvoicesCommand(config, file_path, output, batch_size, error_limit, skip_validation)
     command.debug = debug
     command.execute()
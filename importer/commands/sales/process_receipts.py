@@ -33,7 +33,7 @@ from ...db.session import SessionManager
 class ProcessReceiptsCommand(FileInputCommand):
     """Command to process sales receipts from a sales data file."""
 
-    def __init__(self, config, input_file: Path, output_file: Optional[Path] = None, batch_size: int = 50, error_limit: int = 1000):
+    def __init__(self, config, input_file: Path, output_file: Optional[Path] = None, batch_size: int = 50, error_limit: int = 1000, skip_validation: bool = False):
         """Initialize the command.
 
         Args:
@@ -42,10 +42,12 @@ class ProcessReceiptsCommand(FileInputCommand):
             output_file: Optional path to save results
             batch_size: Number of records to process per batch
             error_limit: Maximum number of errors before stopping
+            skip_validation: Skip product validation rules for trusted input
         """
         super().__init__(config, input_file, output_file)
         self.batch_size = batch_size
         self.error_limit = error_limit
+        self.skip_validation = skip_validation
         self.error_tracker = ErrorTracker()
 
     @command_error_handler
@@ -154,7 +156,8 @@ class ProcessReceiptsCommand(FileInputCommand):
                     self.logger.debug("Initializing ProductProcessor")
                 product_processor = ProductProcessor(
                     {'database_url': self.config.database_url},
-                    batch_size=self.batch_size
+                    batch_size=self.batch_size,
+                    skip_validation=self.skip_validation
                 )
                 product_processor.debug = self.debug
 
@@ -247,15 +250,16 @@ class ProcessReceiptsCommand(FileInputCommand):
 @click.option('--output', type=click.Path(file_okay=True, dir_okay=False, path_type=Path), help='Save processing results to file')
 @click.option('--batch-size', default=50, help='Number of records to process per batch')
 @click.option('--error-limit', default=1000, help='Maximum number of errors before stopping')
+@click.option('--skip-validation', is_flag=True, help='Skip product validation rules for trusted files')
 @click.option('--debug', is_flag=True, help='Enable debug logging')
 @click.pass_context
-def process_receipts(ctx, file_path: Path, output: Optional[Path], batch_size: int, error_limit: int, debug: bool):
+def process_receipts(ctx, file_path: Path, output: Optional[Path], batch_size: int, error_limit: int, skip_validation: bool, debug: bool):
     """Import sales receipt data from a CSV file into the database."""
     config = ctx.obj.get('config')
     if not config:
         click.echo("Error: No configuration found in context")
         return
 
-    command = ProcessReceiptsCommand(config, file_path, output, batch_size, error_limit)
+    command = ProcessReceiptsCommand(config, file_path, output, batch_size, error_limit, skip_validation)
     command.debug = debug
     command.execute()
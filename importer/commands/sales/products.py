@@ -6,7 +6,6 @@ from typing import Optional
 from ...cli.base import FileInputCommand
 from ...cli.config import Config
 from ...processors.product import ProductProcessor
-from ...db.session import SessionManager
 
 class ProcessProductsCommand(FileInputCommand):
     """Process products from a sales data file."""
@@ -14,7 +13,14 @@ class ProcessProductsCommand(FileInputCommand):
     name = 'process-products'
     help = 'Process products from a sales data file'
 
-    def __init__(self, config: Config, input_file: Path, output_file: Optional[Path] = None, batch_size: int = 100):
+    def __init__(
+        self,
+        config: Config,
+        input_file: Path,
+        output_file: Optional[Path] = None,
+        batch_size: int = 100,
+        skip_validation: bool = False
+    ):
         """Initialize command.
         
         Args:
@@ -22,10 +28,11 @@ class ProcessProductsCommand(FileInputCommand):
             input_file: Path to input CSV file
             output_file: Optional path to save results
             batch_size: Number of products to process per batch
+            skip_validation: Skip product validation rules for trusted input
         """
         super().__init__(config, input_file, output_file)
         self.batch_size = batch_size
-        self.session_manager = SessionManager(config.database_url)
+        self.skip_validation = skip_validation
 
     def execute(self) -> Optional[int]:
         """Execute the command.
@@ -33,7 +40,12 @@ class ProcessProductsCommand(FileInputCommand):
         Returns:
             Optional exit code
         """
-        processor = ProductProcessor(self.session_manager, self.batch_size)
+        processor = ProductProcessor(
+            config={'database_url': self.config.database_url},
+            batch_size=self.batch_size,
+            max_workers=self.config.max_workers,
+            skip_validation=self.skip_validation
+        )
         
         self.logger.info(f"Processing products from {self.input_file}")
         self.logger.info(f"Batch size: {self.batch_size}")
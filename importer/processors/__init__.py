@@ -2,12 +2,17 @@
 CSV Processors package for handling different types of CSV imports.
 """
 
-from .validator import validate_customer_file
-from .company import CompanyProcessor
-from .address import AddressProcessor
-from .customer import CustomerProcessor
-from .email import EmailProcessor
-from .phone import PhoneProcessor
+import importlib
+
+# Processors are imported when first referenced
+_LAZY_EXPORTS = {
+    'validate_customer_file': '.validator',
+    'CompanyProcessor': '.company',
+    'AddressProcessor': '.address',
+    'CustomerProcessor': '.customer',
+    'EmailProcessor': '.email',
+    'PhoneProcessor': '.phone',
+}
 
 __all__ = [
     'validate_customer_file',
@@ -17,3 +22,9 @@ __all__ = [
     'EmailProcessor',
     'PhoneProcessor'
 ]
+
+def __getattr__(name: str):
+    """Import public names lazily on first access."""
+    if name in _LAZY_EXPORTS:
+        return getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
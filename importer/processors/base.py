@@ -118,6 +118,66 @@ class BaseProcessor(ABC, Generic[T]):
         """
         pass
     
+    def _run_batch(
+        self,
+        batch_df: pd.DataFrame,
+        batch_num: int,
+        total_batches: Optional[int],
+        start_idx: int,
+        session: Session
+    ) -> Optional[pd.DataFrame]:
+        """Process one batch and commit it, rolling back on failure.
+        
+        Args:
+            batch_df: DataFrame containing the batch data
+            batch_num: 1-based batch number (for logging)
+            total_batches: Total number of batches, if known
+            start_idx: Row offset of the batch within the input
+            session: Session shared by all batches of the run
+            
+        Returns:
+            Processed DataFrame, or None if the batch failed
+        """
+        if self.debug:
+            batch_start = time.time()
+            self.logger.debug(f"\nStarting batch {batch_num}/{total_batches or '?'}")
+        
+        try:
+            if self.debug:
+                session_start = time.time()
+            
+            try:
+                processed_batch = self._process_batch(session, batch_df)
+                session.commit()
+            except Exception:
+                # Keep the session usable for the next batch
+                session.rollback()
+                raise
+            self.stats.successful_batches += 1
+            
+            if self.debug:
+                session_time = time.time() - session_start
+                self.stats.db_operation_time += session_time
+                self.logger.debug(f"Session operations completed in {session_time:.3f}s")
+            
+            if self.debug:
+                batch_time = time.time() - batch_start
+                self.stats.processing_time += batch_time
+                self.logger.debug(f"Batch {batch_num} completed in {batch_time:.3f}s")
+            
+            self.stats.total_processed += len(batch_df)
+            return processed_batch
+            
+        except Exception as e:
+            self.logger.error(f"\nError in batch {batch_num}:")
+            self.logger.error(f"Row index: {start_idx}")
+            self.logger.error(str(e))
+            if self.debug:
+                self.logger.debug(f"Failed row data: {batch_df.iloc[0].to_dict()}")
+            self.stats.failed_batches += 1
+            self.stats.total_errors += 1
+            return None
+    
     def process(self, data: pd.DataFrame) -> pd.DataFrame:
         """Process the data in batches with error handling and progress tracking.
         
@@ -156,50 +216,20 @@ class BaseProcessor(ABC, Generic[T]):
         if self.debug:
             self.logger.debug(f"Processing {total_rows} rows in {total_batches} batches")
         
-        for batch_num, start_idx in enumerate(range(0, total_rows, self.batch_size), 1):
-            if self.debug:
-                batch_start = time.time()
-                self.logger.debug(f"\nStarting batch {batch_num}/{total_batches}")
-            
-            batch_df = data.iloc[start_idx:start_idx + self.batch_size].copy()
-            
-            try:
-                # Process batch with new session
-                with self.session_manager as session:
-                    if self.debug:
-                        session_start = time.time()
-                        self.logger.debug(f"Created session {id(session)}")
-                    
-                    processed_batch = self._process_batch(session, batch_df)
-                    result_dfs.append(processed_batch)
-                    self.stats.successful_batches += 1
-                    
-                    if self.debug:
-                        session_time = time.time() - session_start
-                        self.stats.db_operation_time += session_time
-                        self.logger.debug(f"Session operations completed in {session_time:.3f}s")
-                
-                if self.debug:
-                    batch_time = time.time() - batch_start
-                    self.stats.processing_time += batch_time
-                    self.logger.debug(f"Batch {batch_num} completed in {batch_time:.3f}s")
+        # One session for the whole run, committed per batch
+        with self.session_manager as session:
+            for batch_num, start_idx in enumerate(range(0, total_rows, self.batch_size), 1):
+                batch_df = data.iloc[start_idx:start_idx + self.batch_size].copy()
                 
-                self.stats.total_processed += len(batch_df)
+                processed_batch = self._run_batch(batch_df, batch_num, total_batches, start_idx, session)
+                if processed_batch is None:
+                    continue
+                result_dfs.append(processed_batch)
                 
                 # Check error limit
                 if self.stats.total_errors >= self.error_limit:
                     self.logger.error(f"\nStopping: Error limit ({self.error_limit}) reached")
                     break
-                
-            except Exception as e:
-                self.logger.error(f"\nError in batch {batch_num}:")
-                self.logger.error(f"Row index: {start_idx + batch_df.index.get_loc(batch_df.index[0])}")
-                self.logger.error(str(e))
-                if self.debug:
-                    self.logger.debug(f"Failed row data: {batch_df.iloc[0].to_dict()}")
-                self.stats.failed_batches += 1
-                self.stats.total_errors += 1
-                continue
         
         if self.debug:
             total_time = time.time() - start_time
@@ -42,6 +42,21 @@ class ErrorTracker:
                 }
                 self.error_samples[error_type].append(sample)
     
+    def merge(self, other: 'ErrorTracker') -> None:
+        """Merge errors tracked by another tracker into this one.
+        
+        Args:
+            other: Tracker to merge from
+        """
+        for error_type, samples in other.error_samples.items():
+            for sample in samples:
+                self.add_error(error_type, sample['message'], sample['context'])
+                
+        # Count unique errors that were not sampled
+        for error_key in other.seen_errors - self.seen_errors:
+            self.seen_errors.add(error_key)
+            self.error_counts[error_key.split(':', 1)[0]] += 1
+    
     def get_summary(self) -> Dict:
         """Get error summary.
         
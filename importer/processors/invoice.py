@@ -23,6 +23,9 @@ from .base import BaseProcessor
 class InvoiceProcessor(BaseProcessor[Dict[str, Any]]):
     """Process invoices from sales data."""
     
+    # Date format used by invoice and due dates in the CSV
+    DATE_FORMAT = '%m-%d-%Y'
+    
     def __init__(
         self,
         config: Dict[str, Any],
@@ -94,15 +97,15 @@ class InvoiceProcessor(BaseProcessor[Dict[str, Any]]):
             warnings.append(msg)
         
         # Check date format
-        invalid_dates = []
-        for idx, date_str in df['Invoice Date'].items():
-            if pd.notna(date_str):
-                try:
-                    datetime.strptime(str(date_str), '%m-%d-%Y')
-                except ValueError:
-                    invalid_dates.append(f"Row {idx}: {date_str}")
-                    if len(invalid_dates) >= 3:
-                        break
+        dates = df['Invoice Date']
+        present = dates.notna()
+        parsed = pd.to_datetime(
+            dates[present].astype(str), format=self.DATE_FORMAT, errors='coerce', cache=True
+        )
+        invalid_dates = [
+            f"Row {idx}: {date_str}"
+            for idx, date_str in dates[present][parsed.isna()].head(3).items()
+        ]
         if invalid_dates:
             msg = (f"Found rows with invalid date formats (these will be skipped). "
                   f"Examples: {', '.join(invalid_dates)}")
@@ -160,6 +163,8 @@ class InvoiceProcessor(BaseProcessor[Dict[str, Any]]):
         if self.debug:
             self.logger.debug(f"Found {len(invoices)} unique invoices")
         
+        now = datetime.utcnow()
+        
         # Process each invoice
         for invoice_number, invoice_rows in invoices.items():
             try:
@@ -204,7 +209,6 @@ class InvoiceProcessor(BaseProcessor[Dict[str, Any]]):
                 subtotal = 0
                 tax_amount = 0
                 total_amount = 0
-                now = datetime.utcnow()
                 
                 # Initialize address processor if needed
                 if not self.address_processor:
@@ -262,7 +266,7 @@ class InvoiceProcessor(BaseProcessor[Dict[str, Any]]):
                     existing_order.billingAddressId = billing_id
                     existing_order.shippingAddressId = shipping_id
                     existing_order.terms = row.get(header_mapping.get('payment_terms', ''), '')
-                    existing_order.dueDate = datetime.strptime(row[header_mapping['due_date']], '%m-%d-%Y') if header_mapping.get('due_date') and row.get(header_mapping['due_date']) else None
+                    existing_order.dueDate = datetime.strptime(row[header_mapping['due_date']], self.DATE_FORMAT) if header_mapping.get('due_date') and row.get(header_mapping['due_date']) else None
                     existing_order.poNumber = row.get(header_mapping.get('po_number', ''), '')
                     existing_order.class_ = row.get(header_mapping.get('class', ''), '')
                     existing_order.shippingMethod = row.get(header_mapping.get('shipping_method', ''), '')
@@ -280,7 +284,7 @@ class InvoiceProcessor(BaseProcessor[Dict[str, Any]]):
                         id=generate_uuid(),
                         orderNumber=invoice_number,
                         customerId=customer.id,
-                        orderDate=datetime.strptime(row[header_mapping['invoice_date']], '%m-%d-%Y'),
+                        orderDate=datetime.strptime(row[header_mapping['invoice_date']], self.DATE_FORMAT),
                         status=OrderStatus.OPEN if row.get('Status') != 'Paid' else OrderStatus.CLOSED,
                         paymentStatus=PaymentStatus.UNPAID if row.get('Status') != 'Paid' else PaymentStatus.PAID,
                         subtotal=subtotal,
@@ -290,7 +294,7 @@ class InvoiceProcessor(BaseProcessor[Dict[str, Any]]):
                         billingAddressId=billing_id,
                         shippingAddressId=shipping_id,
                         terms=row.get(header_mapping.get('payment_terms', ''), ''),
-                        dueDate=datetime.strptime(row[header_mapping['due_date']], '%m-%d-%Y') if header_mapping.get('due_date') and row.get(header_mapping['due_date']) else None,
+                        dueDate=datetime.strptime(row[header_mapping['due_date']], self.DATE_FORMAT) if header_mapping.get('due_date') and row.get(header_mapping['due_date']) else None,
                         poNumber=row.get(header_mapping.get('po_number', ''), ''),
                         class_=row.get(header_mapping.get('class', ''), ''),
                         shippingMethod=row.get(header_mapping.get('shipping_method', ''), ''),
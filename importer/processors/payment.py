@@ -109,7 +109,7 @@ class PaymentProcessor(BaseProcessor):
             invoice_groups = df.groupby(header_mapping['invoice_number'])
             total_invoices = len(invoice_groups)
 
-            print(f"\nProcessing payments for {total_invoices} invoices in batches of {self.batch_size}", flush=True)
+            self.logger.info(f"Processing payments for {total_invoices} invoices in batches of {self.batch_size}")
 
             # Process in batches
             current_batch = []
@@ -123,14 +123,17 @@ class PaymentProcessor(BaseProcessor):
 
                 if len(current_batch) >= self.batch_size:
                     self._process_batch(current_batch, is_sales_receipt)
-                    print(f"Batch {batch_num} complete ({len(current_batch)} invoices)", flush=True)
+                    if batch_num % 10 == 0:
+                        self.logger.info(f"Batch {batch_num} complete ({batch_num * self.batch_size} invoices)")
+                    elif self.debug:
+                        self.logger.debug(f"Batch {batch_num} complete ({len(current_batch)} invoices)")
                     current_batch = []
                     batch_num += 1
 
             # Process final batch if any
             if current_batch:
                 self._process_batch(current_batch, is_sales_receipt)
-                print(f"Final batch complete ({len(current_batch)} invoices)", flush=True)
+                self.logger.info(f"Final batch complete ({len(current_batch)} invoices)")
 
             return {
                 'success': self.stats['failed_batches'] == 0,
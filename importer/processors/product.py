@@ -1,13 +1,23 @@
 """Product data processor."""
 
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
-from typing import Dict, Any, List, Optional, Tuple
+from itertools import chain
+from pathlib import Path
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple, Set, Union
 import logging
+import re
+import sys
+import zlib
+import numpy as np
 import pandas as pd
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
 from ..utils import generate_uuid
-from ..utils.system_products import initialize_system_products, is_system_product
+from ..utils.bloom import ScalableBloomFilter
+from ..utils.system_products import ensure_system_products, SYSTEM_PRODUCT_CODES
 from ..db.models import Product
 from ..db.session import SessionManager
 from .base import BaseProcessor
@@ -16,12 +26,34 @@ from .error_tracker import ErrorTracker
 class ProductProcessor(BaseProcessor[Dict[str, Any]]):
     """Process products from sales data."""
     
+    # Field length limits (arbitrary)
+    MAX_CODE_LENGTH = 50
+    MAX_DESCRIPTION_LENGTH = 500
+    
+    # Allowed product code characters: alphanumeric, hyphen, underscore, and period
+    _CODE_CHARS = r'A-Za-z0-9._-'
+    _CODE_RE = re.compile(f'^[{_CODE_CHARS}]*$')
+    
+    # Codes that pass both the character and length checks, for vectorized use
+    _VALID_CODE_PATTERN = f'^[{_CODE_CHARS}]{{1,{MAX_CODE_LENGTH}}}$'
+    
+    # Most products held in the in-memory catalog cache
+    PRODUCT_CACHE_LIMIT = 50000
+    
+    # Processed codes kept in an exact set up to this many, then moved to a Bloom filter
+    PROCESSED_CODES_LIMIT = 1_000_000
+    
+    # Rows per INSERT statement when bulk loading new products
+    INSERT_PAGE_SIZE = 1000
+    
     def __init__(
         self,
         config: Dict[str, Any],
         batch_size: int = 100,
         error_limit: int = 1000,
-        debug: bool = False
+        debug: bool = False,
+        max_workers: int = 1,
+        skip_validation: bool = False
     ):
         """Initialize the processor.
         
@@ -30,10 +62,17 @@ class ProductProcessor(BaseProcessor[Dict[str, Any]]):
             batch_size: Number of records to process per batch
             error_limit: Maximum number of errors before stopping
             debug: Enable debug logging
+            max_workers: Number of worker processes used by process_file
+            skip_validation: Skip product validation rules for trusted input
         """
         session_manager = SessionManager(config['database_url'])
         super().__init__(session_manager, batch_size, error_limit, debug)
         
+        # Kept so worker processes can open their own sessions
+        self.config = config
+        self.max_workers = max_workers
+        self.skip_validation = skip_validation
+        
         # Initialize error tracker
         self.error_tracker = ErrorTracker()
         
@@ -43,8 +82,12 @@ class ProductProcessor(BaseProcessor[Dict[str, Any]]):
             'description': ['Product/Service Description']
         }
         
+        # Column positions resolved for the current file's header
+        self._positions_key: Optional[Tuple[str, ...]] = None
+        self._positions: Tuple[int, Optional[int]] = (0, None)
+        
         # Track processed products across batches
-        self.processed_codes: Set[str] = set()
+        self.processed_codes: Union[Set[str], ScalableBloomFilter] = set()
         
         # Add product-specific stats
         self.stats.total_products = 0
@@ -58,10 +101,26 @@ class ProductProcessor(BaseProcessor[Dict[str, Any]]):
             self.logger.debug("Initializing system products...")
             
         with self.session_manager as session:
-            initialize_system_products(session)
+            ensure_system_products(session, config['database_url'])
+            
+            # Preload the catalog when it is small enough to hold in memory;
+            # otherwise each batch looks up its own codes
+            self._product_cache: Optional[Dict[str, Tuple[str, Optional[str]]]] = None
+            if session.query(func.count(Product.id)).scalar() <= self.PRODUCT_CACHE_LIMIT:
+                self._product_cache = {
+                    code: (product_id, description)
+                    for product_id, code, description in session.query(
+                        Product.id, Product.productCode, Product.description
+                    )
+                }
+            
+            # This batch's cache entries, applied once the batch commits
+            self._cache_updates: Dict[str, Tuple[str, Optional[str]]] = {}
             
         if self.debug:
             self.logger.debug("System products initialized")
+            if self._product_cache is not None:
+                self.logger.debug(f"Cached {len(self._product_cache)} existing products")
 
     def validate_data(self, df: pd.DataFrame) -> Tuple[List[str], List[str]]:
         """Validate data before processing.
@@ -117,10 +176,9 @@ class ProductProcessor(BaseProcessor[Dict[str, Any]]):
         """
         if not product_code:
             return "Product code is required"
-        if len(product_code) > 50:  # Arbitrary limit
+        if len(product_code) > self.MAX_CODE_LENGTH:
             return "Product code exceeds maximum length"
-        # Allow alphanumeric, hyphen, underscore, and period
-        if not all(c.isalnum() or c in '-_.' for c in product_code):
+        if not self._CODE_RE.match(product_code):
             return "Product code contains invalid characters (only letters, numbers, hyphen, underscore, and period allowed)"
         return None
         
@@ -135,7 +193,7 @@ class ProductProcessor(BaseProcessor[Dict[str, Any]]):
         """
         if not description:
             return None  # Description is optional
-        if len(description) > 500:  # Arbitrary limit
+        if len(description) > self.MAX_DESCRIPTION_LENGTH:
             return "Description exceeds maximum length"
         return None
         
@@ -170,6 +228,120 @@ class ProductProcessor(BaseProcessor[Dict[str, Any]]):
             
         return errors
 
+    def _map_headers(self, columns: pd.Index) -> Dict[str, str]:
+        """Map CSV headers to our standardized field names.
+        
+        Args:
+            columns: Column names from the CSV
+            
+        Returns:
+            Dictionary of standardized field name to CSV column name
+        """
+        header_mapping = {}
+        for std_field, possible_names in self.field_mappings.items():
+            for name in possible_names:
+                if name in columns:
+                    header_mapping[std_field] = name
+                    if self.debug:
+                        self.logger.debug(f"Mapped {std_field} -> {name}")
+                    break
+        return header_mapping
+
+    def _column_positions(self, columns: pd.Index) -> Tuple[int, Optional[int]]:
+        """Resolve the product code and description columns to positions.
+        
+        Chunks of one file share their columns, so the mapping is only
+        rebuilt when the columns change.
+        
+        Args:
+            columns: Column names of the batch
+            
+        Returns:
+            Tuple of (code position, description position or None)
+        """
+        key = tuple(columns)
+        if key != self._positions_key:
+            header_mapping = self._map_headers(columns)
+            if 'product_code' not in header_mapping:
+                raise ValueError("Could not find product code column")
+            desc_name = header_mapping.get('description')
+            self._positions = (
+                columns.get_loc(header_mapping['product_code']),
+                columns.get_loc(desc_name) if desc_name is not None else None
+            )
+            self._positions_key = key
+        return self._positions
+
+    def _validate_batch(self, codes: pd.Series, descs: pd.Series) -> pd.Series:
+        """Validate a batch of normalized product codes and descriptions.
+        
+        A cheap vectorized pass flags rows that could fail any rule in
+        _validate_product_data; only those rows get the full per-row check.
+        
+        Args:
+            codes: Normalized product codes
+            descs: Stripped descriptions
+            
+        Returns:
+            Boolean mask of rows that failed validation
+        """
+        suspect_mask = (
+            ~codes.str.match(self._VALID_CODE_PATTERN)
+            | codes.str.startswith('TEST-')
+            | (descs.str.len() > self.MAX_DESCRIPTION_LENGTH)
+            | descs.str.lower().str.startswith('deprecated')
+        )
+        
+        # Mark rows by position so the mask never depends on index labels
+        invalid = np.zeros(len(codes), dtype=bool)
+        for pos in np.flatnonzero(suspect_mask.to_numpy()):
+            product_code = codes.iat[pos]
+            description = descs.iat[pos]
+            validation_errors = self._validate_product_data(product_code, description)
+            if not validation_errors:
+                continue
+            if self.debug:
+                self.logger.debug(f"Validation errors for {product_code}: {validation_errors}")
+            self.stats.validation_errors += len(validation_errors)
+            for error in validation_errors:
+                self.error_tracker.add_error(
+                    'validation',
+                    error,
+                    {'product_code': product_code, 'description': description}
+                )
+            invalid[pos] = True
+            
+        return pd.Series(invalid, index=codes.index)
+
+    @staticmethod
+    def _normalize_codes(codes: pd.Series) -> pd.Series:
+        """Normalize raw product codes (missing -> empty, stripped, upper case).
+        
+        Args:
+            codes: Raw product code column
+            
+        Returns:
+            Normalized product codes
+        """
+        return ProductProcessor._as_text(codes).str.strip().str.upper()
+
+    @staticmethod
+    def _as_text(values: pd.Series) -> pd.Series:
+        """Coerce a column to strings, missing values becoming empty.
+        
+        Columns read by process_file (dtype=str, keep_default_na=False) are
+        already all strings and are returned as-is.
+        
+        Args:
+            values: Raw column
+            
+        Returns:
+            Column of strings
+        """
+        if pd.api.types.is_string_dtype(values):
+            return values
+        return values.fillna('').astype(str)
+
     def _process_batch(self, session: Session, batch_df: pd.DataFrame) -> pd.DataFrame:
         """Process a batch of product rows.
         
@@ -183,94 +355,424 @@ class ProductProcessor(BaseProcessor[Dict[str, Any]]):
         if self.debug:
             self.logger.debug(f"Processing batch of {len(batch_df)} rows")
             
-        # Map CSV headers to our standardized field names
-        header_mapping = {}
-        for std_field, possible_names in self.field_mappings.items():
-            for name in possible_names:
-                if name in batch_df.columns:
-                    header_mapping[std_field] = name
-                    if self.debug:
-                        self.logger.debug(f"Mapped {std_field} -> {name}")
-                    break
+        code_idx, desc_idx = self._column_positions(batch_df.columns)
+            
+        # Normalize the whole batch at once. A fresh index keeps the masks
+        # below aligned even when the caller's index has repeated labels
+        codes = self._normalize_codes(batch_df.iloc[:, code_idx]).reset_index(drop=True)
+        if desc_idx is not None:
+            descs = self._as_text(batch_df.iloc[:, desc_idx]).str.strip().reset_index(drop=True)
+        else:
+            descs = pd.Series('', index=codes.index)
+        
+        if self.skip_validation:
+            # Trusted input: only drop rows without a code
+            invalid_mask = codes == ''
+            self.stats.skipped += int(invalid_mask.sum())
+        else:
+            invalid_mask = self._validate_batch(codes, descs)
+        
+        # Skip duplicates and system products (already initialized)
+        valid_codes = codes[~invalid_mask]
+        skip_mask = valid_codes.isin(SYSTEM_PRODUCT_CODES) | valid_codes.duplicated()
+        if isinstance(self.processed_codes, set):
+            # Per-item lookups; isin would rehash the whole set every batch
+            skip_mask |= valid_codes.map(self.processed_codes.__contains__).astype(bool)
+        self.stats.skipped += int(skip_mask.sum())
+        
+        # New codes from this batch, first occurrence wins. Codes are
+        # interned so processed_codes and the cache share one object per code
+        pending: Dict[str, str] = {
+            sys.intern(code): description
+            for code, description in zip(valid_codes[~skip_mask], descs[~invalid_mask][~skip_mask])
+        }
+        
+        # Bloom filter hits are only possibly processed, confirmed below
+        if isinstance(self.processed_codes, set):
+            maybe_seen: Set[str] = set()
+        else:
+            maybe_seen = {code for code in pending if code in self.processed_codes}
         
-        if 'product_code' not in header_mapping:
-            raise ValueError("Could not find product code column")
+        if not pending:
+            return batch_df
             
-        # Process each row
-        for idx, row in batch_df.iterrows():
-            try:
-                # Get and validate product data
-                product_code = str(row[header_mapping['product_code']]).strip().upper()
-                description = str(row.get(header_mapping.get('description', ''), '')).strip()
-                
-                validation_errors = self._validate_product_data(product_code, description)
-                if validation_errors:
+        # Resolve existing products from the catalog cache, or in one query
+        if self._product_cache is not None:
+            existing = {
+                code: self._product_cache[code]
+                for code in pending
+                if code in self._product_cache
+            }
+        else:
+            existing = {
+                code: (product_id, current_description)
+                for product_id, code, current_description in session.query(
+                    Product.id, Product.productCode, Product.description
+                ).filter(Product.productCode.in_(list(pending)))
+            }
+        
+        # A processed code was committed by an earlier batch, so a hit
+        # with no existing product is a false positive
+        for code in maybe_seen:
+            if code in existing:
+                del pending[code]
+                self.stats.skipped += 1
+        
+        self._track_processed(pending)
+        self.stats.total_products += len(pending)
+        
+        now = datetime.utcnow()
+        new_products = []
+        updates = []
+        cache_updates = {}
+        for product_code, description in pending.items():
+            if product_code in existing:
+                product_id, current_description = existing[product_code]
+                if description and description != current_description:
                     if self.debug:
-                        self.logger.debug(f"Validation errors for {product_code}: {validation_errors}")
-                    self.stats.validation_errors += len(validation_errors)
-                    for error in validation_errors:
-                        self.error_tracker.add_error(
-                            'validation',
-                            error,
-                            {'row': row.to_dict()}
-                        )
-                    continue
-                
-                # Skip duplicates and system products (already initialized)
-                if product_code in self.processed_codes:
-                    self.stats.skipped += 1
-                    continue
-                if is_system_product(product_code):
+                        self.logger.debug(f"Updating description for {product_code}")
+                    updates.append({
+                        'id': product_id,
+                        'description': description,
+                        'modifiedAt': now
+                    })
+                    cache_updates[product_code] = (product_id, description)
+                else:
+                    # No changes needed
                     self.stats.skipped += 1
-                    continue
-                self.processed_codes.add(product_code)
-                
-                self.stats.total_products += 1
+            else:
+                if self.debug:
+                    self.logger.debug(f"Creating new product: {product_code}")
+                product_id = generate_uuid()
+                new_products.append({
+                    'id': product_id,
+                    'productCode': product_code,
+                    'name': product_code,  # Use code as name initially
+                    'description': description,
+                    'createdAt': now,
+                    'modifiedAt': now
+                })
+                cache_updates[product_code] = (product_id, description)
+        
+        if updates:
+            session.bulk_update_mappings(Product, updates)
+            self.stats.updated += len(updates)
+            
+        if new_products:
+            created = self._insert_products(session, new_products)
+            self.stats.created += created
+            self.stats.skipped += len(new_products) - created
+            if created < len(new_products) and self._product_cache is not None:
+                # Another session inserted some of these codes, so the cache
+                # is stale; later batches query the database
+                if self.debug:
+                    self.logger.debug(
+                        f"Dropping product cache after {len(new_products) - created} conflicting inserts"
+                    )
+                self._product_cache = None
+            
+        self._cache_updates = cache_updates
+        
+        return batch_df
+    
+    def _run_batch(
+        self,
+        batch_df: pd.DataFrame,
+        batch_num: int,
+        total_batches: Optional[int],
+        start_idx: int,
+        session: Session
+    ) -> Optional[pd.DataFrame]:
+        """Process and commit one batch, then update the catalog cache.
+        
+        Cache entries are only applied after the commit succeeds, so a
+        rolled-back batch never leaves products in the cache.
+        """
+        self._cache_updates = {}
+        processed_batch = super()._run_batch(batch_df, batch_num, total_batches, start_idx, session)
+        
+        if processed_batch is not None and self._product_cache is not None:
+            self._product_cache.update(self._cache_updates)
+            if len(self._product_cache) > self.PRODUCT_CACHE_LIMIT:
+                # Catalog outgrew the cache; later batches query the database
+                if self.debug:
+                    self.logger.debug(f"Dropping product cache at {len(self._product_cache)} products")
+                self._product_cache = None
+        self._cache_updates = {}
+        
+        return processed_batch
+
+    def _insert_products(self, session: Session, new_products: List[Dict[str, Any]]) -> int:
+        """Insert new products, leaving codes inserted concurrently as-is.
+        
+        On psycopg2 the rows are sent with execute_values in pages of
+        INSERT_PAGE_SIZE; other drivers use a multi-row SQLAlchemy insert.
+        
+        Args:
+            session: Database session for this batch
+            new_products: Product rows to insert
+            
+        Returns:
+            Number of products actually created
+        """
+        if session.get_bind().dialect.driver == 'psycopg2':
+            from psycopg2.extras import execute_values
+            
+            columns = ('id', 'productCode', 'name', 'description', 'createdAt', 'modifiedAt')
+            cursor = session.connection().connection.cursor()
+            try:
+                inserted = execute_values(
+                    cursor,
+                    'INSERT INTO "Product" ({}) VALUES %s '
+                    'ON CONFLICT ("productCode") DO NOTHING RETURNING "id"'.format(
+                        ', '.join(f'"{column}"' for column in columns)
+                    ),
+                    [tuple(product[column] for column in columns) for product in new_products],
+                    page_size=self.INSERT_PAGE_SIZE,
+                    fetch=True
+                )
+            finally:
+                cursor.close()
+            return len(inserted)
+            
+        result = session.execute(
+            insert(Product)
+            .values(new_products)
+            .on_conflict_do_nothing(index_elements=['productCode'])
+        )
+        return result.rowcount if result.rowcount >= 0 else len(new_products)
+
+    def _track_processed(self, codes: Iterable[str]) -> None:
+        """Record processed product codes.
+        
+        Codes are kept in an exact set until PROCESSED_CODES_LIMIT is
+        reached, then moved into a Bloom filter to bound memory use.
+        
+        Args:
+            codes: Product codes processed in the current batch
+        """
+        self.processed_codes.update(codes)
+        if isinstance(self.processed_codes, set) and len(self.processed_codes) > self.PROCESSED_CODES_LIMIT:
+            if self.debug:
+                self.logger.debug(
+                    f"Switching processed codes to a Bloom filter at {len(self.processed_codes)} codes"
+                )
+            bloom = ScalableBloomFilter(initial_capacity=self.PROCESSED_CODES_LIMIT * 2)
+            bloom.update(self.processed_codes)
+            self.processed_codes = bloom
+
+    def process_file(self, file_path: Path) -> Dict[str, Any]:
+        """Process a sales CSV file, streaming it in batch-sized chunks.
+        
+        Only one chunk is held in memory at a time, so memory use stays
+        constant regardless of file size. With max_workers > 1 the rows are
+        split across worker processes by product code.
+        
+        Args:
+            file_path: Path to the CSV file
+            
+        Returns:
+            Dictionary with processing results
+        """
+        if self.debug:
+            self.logger.debug(f"Reading CSV file: {file_path}")
+            
+        # Open chunked reader and peek at the first chunk
+        try:
+            reader = self._open_reader(file_path)
+            first_chunk = next(reader, None)
+        except Exception as e:
+            return self._file_error_result(f"Error reading CSV file: {str(e)}")
+        
+        if first_chunk is not None:
+            # Columns are the same for every chunk, so validate them once
+            critical_issues, _ = self.validate_data(first_chunk)
+            if critical_issues:
+                self.logger.error("\nData validation failed:")
+                for issue in critical_issues:
+                    self.logger.error(f"  - {issue}")
+                self.stats.total_errors += len(critical_issues)
+                return self._file_error_result("; ".join(critical_issues))
+            
+            try:
+                if self.max_workers > 1:
+                    reader.close()
+                    self._process_file_parallel(file_path)
+                else:
+                    self._process_chunks(chain([first_chunk], reader))
+            except Exception as e:
+                return self._file_error_result(f"Error processing CSV file: {str(e)}")
+            
+            if self.debug:
+                self.logger.debug(f"Read {self.stats.total_processed} rows from {file_path}")
+        
+        self.stats.completed_at = datetime.utcnow()
+        
+        return {
+            'success': True,
+            'summary': {
+                'stats': self.get_stats(),
+                'errors': self.error_tracker.get_summary()
+            }
+        }
+        
+    def _open_reader(self, file_path: Path, chunksize: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """Open a chunked CSV reader for the mapped product columns, read as strings.
+        
+        Args:
+            file_path: Path to the CSV file
+            chunksize: Rows per chunk (defaults to batch_size)
+            
+        Returns:
+            Iterator of DataFrame chunks
+        """
+        # Read only the header first so the reader parses just the mapped columns
+        columns = pd.read_csv(file_path, nrows=0).columns
+        usecols = list(dict.fromkeys(self._map_headers(columns).values()))
+        
+        return pd.read_csv(
+            file_path,
+            chunksize=chunksize or self.batch_size,
+            usecols=usecols or None,
+            dtype=str,
+            keep_default_na=False
+        )
+        
+    def _process_chunks(self, chunks: Iterable[pd.DataFrame]) -> None:
+        """Process DataFrame chunks as batches until exhausted or the error limit is hit.
+        
+        Args:
+            chunks: Iterable of DataFrame chunks
+        """
+        start_idx = 0
+        # One session for the whole file, committed per batch
+        with self.session_manager as session:
+            for batch_num, batch_df in enumerate(chunks, 1):
+                self._run_batch(batch_df, batch_num, None, start_idx, session)
+                start_idx += len(batch_df)
                 
-                # Get or create product
-                product = session.query(Product).filter(
-                    Product.productCode == product_code
-                ).first()
+                if batch_num % 10 == 0:
+                    self.logger.info(f"Processed {batch_num} batches ({start_idx} rows)")
                 
-                now = datetime.utcnow()
+                if self.stats.total_errors >= self.error_limit:
+                    self.logger.error(f"\nStopping: Error limit ({self.error_limit}) reached")
+                    break
                 
-                if product:
-                    if self.debug:
-                        self.logger.debug(f"Found existing product: {product_code}")
-                    # Update existing product
-                    if description and description != product.description:
-                        product.description = description
-                        product.modifiedAt = now
-                        self.stats.updated += 1
-                        if self.debug:
-                            self.logger.debug(f"Updated description for {product_code}")
-                    else:
-                        # No changes needed
-                        self.stats.skipped += 1
-                else:
-                    if self.debug:
-                        self.logger.debug(f"Creating new product: {product_code}")
-                    # Create new product
-                    product = Product(
-                        id=generate_uuid(),
-                        productCode=product_code,
-                        name=product_code,  # Use code as name initially
-                        description=description,
-                        createdAt=now,
-                        modifiedAt=now
-                    )
-                    session.add(product)
-                    self.stats.created += 1
-                    
-            except Exception as e:
-                self.error_tracker.add_error(
-                    'processing',
-                    str(e),
-                    {'row': row.to_dict()}
+    def _process_file_parallel(self, file_path: Path) -> None:
+        """Process a CSV file across worker processes and merge their results.
+        
+        Each worker owns one shard of product codes (see _shard_chunks), so a
+        given code is always handled by the same worker and deduplication
+        behaves exactly as in a sequential run. The error limit is split
+        across the workers so the whole run stops near error_limit.
+        
+        Args:
+            file_path: Path to the CSV file
+        """
+        if self.debug:
+            self.logger.debug(f"Processing {file_path} with {self.max_workers} workers")
+            
+        # Pooled connections must not be shared with forked workers
+        self.session_manager.engine.dispose()
+        
+        # Round up so every worker may hit at least one error
+        shard_error_limit = -(-self.error_limit // self.max_workers)
+        
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(
+                    _process_shard,
+                    self.config,
+                    file_path,
+                    shard,
+                    self.max_workers,
+                    self.batch_size,
+                    shard_error_limit,
+                    self.debug,
+                    self.skip_validation
                 )
-                self.stats.total_errors += 1
-                if self.debug:
-                    self.logger.debug(f"Error processing row: {str(e)}", exc_info=True)
-                continue
+                for shard in range(self.max_workers)
+            ]
+            for future in as_completed(futures):
+                shard_stats, shard_errors = future.result()
+                for key, value in shard_stats.items():
+                    if isinstance(value, (int, float)) and not isinstance(value, bool):
+                        setattr(self.stats, key, getattr(self.stats, key) + value)
+                self.error_tracker.merge(shard_errors)
+                
+    def _shard_chunks(
+        self,
+        chunks: Iterable[pd.DataFrame],
+        shard: int,
+        num_shards: int
+    ) -> Iterator[pd.DataFrame]:
+        """Yield only the rows of each chunk whose product code belongs to a shard.
         
-        return batch_df
+        Args:
+            chunks: Iterable of DataFrame chunks
+            shard: Shard number to keep
+            num_shards: Total number of shards
+            
+        Returns:
+            Iterator of filtered DataFrame chunks
+        """
+        for chunk in chunks:
+            code_col = self._map_headers(chunk.columns)['product_code']
+            codes = self._normalize_codes(chunk[code_col])
+            in_shard = codes.map(lambda code: zlib.crc32(code.encode()) % num_shards == shard)
+            if in_shard.any():
+                yield chunk[in_shard]
+        
+    def _file_error_result(self, error_msg: str) -> Dict[str, Any]:
+        """Build the result dictionary for a file that could not be processed.
+        
+        Args:
+            error_msg: Error message to report
+            
+        Returns:
+            Dictionary with processing results
+        """
+        self.logger.error(error_msg)
+        return {
+            'success': False,
+            'error': error_msg,
+            'summary': {
+                'stats': self.get_stats(),
+                'errors': self.error_tracker.get_summary()
+            }
+        }
+
+def _process_shard(
+    config: Dict[str, Any],
+    file_path: Path,
+    shard: int,
+    num_shards: int,
+    batch_size: int,
+    error_limit: int,
+    debug: bool,
+    skip_validation: bool
+) -> Tuple[Dict[str, Any], ErrorTracker]:
+    """Process one product code shard of a CSV file in a worker process.
+    
+    Args:
+        config: Configuration dictionary containing database_url
+        file_path: Path to the CSV file
+        shard: Shard number to process
+        num_shards: Total number of shards
+        batch_size: Number of records to process per batch
+        error_limit: Maximum number of errors before this shard stops
+        debug: Enable debug logging
+        skip_validation: Skip product validation rules for trusted input
+        
+    Returns:
+        Tuple of (stats, error_tracker) for the shard
+    """
+    processor = ProductProcessor(
+        config, batch_size, error_limit, debug, skip_validation=skip_validation
+    )
+    
+    # Read num_shards batches at a time so each filtered batch is about batch_size rows
+    reader = processor._open_reader(file_path, chunksize=batch_size * num_shards)
+    processor._process_chunks(processor._shard_chunks(reader, shard, num_shards))
+    
+    return processor.stats.to_dict(), processor.error_tracker
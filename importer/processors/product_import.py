@@ -9,7 +9,7 @@ from pathlib import Path
 from sqlalchemy.orm import Session
 
 from ..utils import generate_uuid
-from ..utils.system_products import initialize_system_products, is_system_product
+from ..utils.system_products import ensure_system_products, is_system_product
 from ..db.models import Product, ProductPriceHistory
 from ..db.session import SessionManager
 from .base import BaseProcessor
@@ -69,7 +69,7 @@ class ProductImportProcessor(BaseProcessor[Dict[str, Any]]):
             self.logger.debug("Initializing system products...")
             
         with self.session_manager as session:
-            initialize_system_products(session)
+            ensure_system_products(session, config['database_url'])
             
         if self.debug:
             self.logger.debug("System products initialized")
@@ -137,6 +137,8 @@ class ProductImportProcessor(BaseProcessor[Dict[str, Any]]):
         if 'product_code' not in header_mapping:
             raise ValueError("Could not find product code column")
             
+        now = datetime.utcnow()
+        
         # Process each row
         for idx, row in batch_df.iterrows():
             try:
@@ -164,7 +166,7 @@ class ProductImportProcessor(BaseProcessor[Dict[str, Any]]):
                         self.error_tracker.add_error(
                             'validation',
                             f"Invalid cost value: {cost_str}",
-                            {'row': row.to_dict()}
+                            {'product_code': product_code, 'cost': cost_str}
                         )
                         self.stats.validation_errors += 1
                 
@@ -178,7 +180,7 @@ class ProductImportProcessor(BaseProcessor[Dict[str, Any]]):
                         self.error_tracker.add_error(
                             'validation',
                             f"Invalid list price value: {price_str}",
-                            {'row': row.to_dict()}
+                            {'product_code': product_code, 'list_price': price_str}
                         )
                         self.stats.validation_errors += 1
                 
@@ -198,8 +200,6 @@ class ProductImportProcessor(BaseProcessor[Dict[str, Any]]):
                     Product.productCode == product_code
                 ).first()
                 
-                now = datetime.utcnow()
-                
                 if product:
                     if self.debug:
                         self.logger.debug(f"Found existing product: {product_code}")
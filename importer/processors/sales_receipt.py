@@ -192,6 +192,8 @@ class SalesReceiptProcessor(BaseProcessor[Dict[str, Any]]):
         if self.debug:
             self.logger.debug(f"Grouped {len(batch_df)} rows into {len(receipts)} receipts in {time.time() - group_start:.3f}s")
         
+        now = datetime.utcnow()
+        
         # Process each receipt
         for receipt_number, receipt_rows in receipts.items():
             try:
@@ -288,7 +290,6 @@ class SalesReceiptProcessor(BaseProcessor[Dict[str, Any]]):
                 subtotal = 0
                 tax_amount = 0
                 total_amount = 0
-                now = datetime.utcnow()
                 
                 # Initialize address processor if needed
                 if not self.address_processor:
@@ -2,25 +2,69 @@
 
 import os
 import pytest
-import tempfile
 import csv
 from datetime import datetime
-from pathlib import Path
 from dotenv import load_dotenv
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, make_url, text
 from sqlalchemy.orm import Session, sessionmaker
 
 from ..db.models import Base, Company, Product, Customer
+from ..utils.system_products import reset_system_products_state
 
 # Load test environment variables
 load_dotenv('.env.test')
 
+# Tables emptied between tests, in dependency order
+TEST_TABLES = [
+    'OrderItem',
+    'Order',
+    'CustomerEmail',
+    'CustomerPhone',
+    'Customer',
+    'Product',
+    'Company',
+    'Address'
+]
+
+def _truncate_tables(conn):
+    """Truncate all test tables in a single statement."""
+    tables = ', '.join(f'"{table}"' for table in TEST_TABLES)
+    conn.execute(text(f'TRUNCATE TABLE {tables} CASCADE'))
+
+def _worker_database_url(database_url):
+    """Get the database URL for this pytest-xdist worker.
+    
+    Each worker gets its own database (named after the test database and
+    the worker id) so parallel tests never truncate each other's tables.
+    TEST_DATABASE_URL is updated to match, since tests read it directly.
+    """
+    worker_id = os.getenv('PYTEST_XDIST_WORKER')
+    if not worker_id:
+        return database_url
+    
+    url = make_url(database_url)
+    worker_db = f"{url.database}_{worker_id}"
+    admin_engine = create_engine(url, isolation_level='AUTOCOMMIT')
+    with admin_engine.connect() as conn:
+        exists = conn.execute(
+            text("SELECT 1 FROM pg_database WHERE datname = :name"),
+            {'name': worker_db}
+        ).scalar()
+        if not exists:
+            conn.execute(text(f'CREATE DATABASE "{worker_db}"'))
+    admin_engine.dispose()
+    
+    worker_url = url.set(database=worker_db).render_as_string(hide_password=False)
+    os.environ['TEST_DATABASE_URL'] = worker_url
+    return worker_url
+
 @pytest.fixture(scope="session")
 def engine():
     """Create test database engine."""
     database_url = os.getenv('TEST_DATABASE_URL')
     if not database_url:
         raise ValueError("TEST_DATABASE_URL not set in .env.test")
+    database_url = _worker_database_url(database_url)
     
     print(f"\nConnecting to database...")
     engine = create_engine(database_url)
@@ -56,30 +100,14 @@ def engine():
                 conn.execute(text(schema))
                 conn.commit()
         else:
-            print("Tables already exist, truncating...")
-            # Truncate all tables in the correct order
-            conn.execute(text('TRUNCATE TABLE "OrderItem" CASCADE'))
-            conn.execute(text('TRUNCATE TABLE "Order" CASCADE'))
-            conn.execute(text('TRUNCATE TABLE "CustomerEmail" CASCADE'))
-            conn.execute(text('TRUNCATE TABLE "CustomerPhone" CASCADE'))
-            conn.execute(text('TRUNCATE TABLE "Customer" CASCADE'))
-            conn.execute(text('TRUNCATE TABLE "Product" CASCADE'))
-            conn.execute(text('TRUNCATE TABLE "Company" CASCADE'))
-            conn.execute(text('TRUNCATE TABLE "Address" CASCADE'))
-            conn.commit()
+            # Reuse the existing schema; clean_tables empties it per test
+            print("Tables already exist, reusing schema")
     
     yield engine
     
     # Clean up by truncating all tables
     with engine.connect() as conn:
-        conn.execute(text('TRUNCATE TABLE "OrderItem" CASCADE'))
-        conn.execute(text('TRUNCATE TABLE "Order" CASCADE'))
-        conn.execute(text('TRUNCATE TABLE "CustomerEmail" CASCADE'))
-        conn.execute(text('TRUNCATE TABLE "CustomerPhone" CASCADE'))
-        conn.execute(text('TRUNCATE TABLE "Customer" CASCADE'))
-        conn.execute(text('TRUNCATE TABLE "Product" CASCADE'))
-        conn.execute(text('TRUNCATE TABLE "Company" CASCADE'))
-        conn.execute(text('TRUNCATE TABLE "Address" CASCADE'))
+        _truncate_tables(conn)
         conn.commit()
 
 @pytest.fixture(autouse=True)
@@ -87,15 +115,10 @@ def clean_tables(engine):
     """Automatically truncate tables before each test."""
     # Clean up by truncating all tables
     with engine.connect() as conn:
-        conn.execute(text('TRUNCATE TABLE "OrderItem" CASCADE'))
-        conn.execute(text('TRUNCATE TABLE "Order" CASCADE'))
-        conn.execute(text('TRUNCATE TABLE "CustomerEmail" CASCADE'))
-        conn.execute(text('TRUNCATE TABLE "CustomerPhone" CASCADE'))
-        conn.execute(text('TRUNCATE TABLE "Customer" CASCADE'))
-        conn.execute(text('TRUNCATE TABLE "Product" CASCADE'))
-        conn.execute(text('TRUNCATE TABLE "Company" CASCADE'))
-        conn.execute(text('TRUNCATE TABLE "Address" CASCADE'))
+        _truncate_tables(conn)
         conn.commit()
+    # System products were truncated too, so let processors recreate them
+    reset_system_products_state()
     yield
 
 @pytest.fixture
@@ -125,7 +148,6 @@ def populated_session(session, clean_tables):
         name='Test Company',
         domain='example.com'
     )
-    session.add(company)
     
     # Create test product
     product = Product(
@@ -136,14 +158,14 @@ def populated_session(session, clean_tables):
         createdAt=datetime.utcnow(),
         modifiedAt=datetime.utcnow()
     )
-    session.add(product)
     
+    session.add_all([company, product])
     session.commit()
     yield session
 
-def create_test_csv(rows):
-    """Create a temporary CSV file with test data."""
-    fd, path = tempfile.mkstemp(suffix='.csv')
+def create_test_csv(tmp_path, rows):
+    """Create a CSV file with test data in a test's tmp_path directory."""
+    path = tmp_path / 'invoices.csv'
     with open(path, 'w', newline='') as f:
         writer = csv.DictWriter(f, fieldnames=[
             'Invoice No',
@@ -161,4 +183,4 @@ def create_test_csv(rows):
         writer.writeheader()
         for row in rows:
             writer.writerow(row)
-    return Path(path)
+    return path
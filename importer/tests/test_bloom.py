@@ -0,0 +1,37 @@
+"""Tests for Bloom filter utilities."""
+from ..utils.bloom import BloomFilter, ScalableBloomFilter
+
+def test_bloom_filter_no_false_negatives():
+    """Test every added item is reported as present."""
+    bloom = ScalableBloomFilter(initial_capacity=1000, error_rate=0.01)
+    codes = [f'PROD{i}' for i in range(1000)]
+    bloom.update(codes)
+    
+    assert all(code in bloom for code in codes)
+
+def test_bloom_filter_grows_past_capacity():
+    """Test a full filter adds a larger one and keeps earlier items."""
+    bloom = ScalableBloomFilter(initial_capacity=100, error_rate=0.01)
+    codes = [f'PROD{i}' for i in range(250)]
+    bloom.update(codes)
+    
+    assert len(bloom.filters) >= 2
+    assert bloom.filters[1].capacity == 2 * bloom.filters[0].capacity
+    assert all(code in bloom for code in codes)
+
+def test_bloom_filter_false_positive_rate():
+    """Test the false positive rate stays near the configured error rate."""
+    error_rate = 0.01
+    
+    # A single filter at capacity
+    bloom = BloomFilter(capacity=1000, error_rate=error_rate)
+    for i in range(1000):
+        bloom.add(f'PROD{i}')
+    false_positives = sum(f'OTHER{i}' in bloom for i in range(20000))
+    assert false_positives / 20000 < 2 * error_rate
+    
+    # A scalable filter after growing
+    scalable = ScalableBloomFilter(initial_capacity=1000, error_rate=error_rate)
+    scalable.update(f'PROD{i}' for i in range(5000))
+    false_positives = sum(f'OTHER{i}' in scalable for i in range(20000))
+    assert false_positives / 20000 < 2 * error_rate
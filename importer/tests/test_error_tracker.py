@@ -0,0 +1,36 @@
+"""Tests for error tracking and aggregation."""
+from ..processors.error_tracker import ErrorTracker
+
+def test_error_tracker_merge_counts_unique_errors():
+    """Test merging trackers counts each unique error once."""
+    tracker1 = ErrorTracker()
+    tracker1.add_error('validation', 'Product code is required')
+    tracker1.add_error('validation', 'Test products not allowed in production')
+    
+    tracker2 = ErrorTracker()
+    tracker2.add_error('validation', 'Product code is required')  # Also seen by tracker1
+    tracker2.add_error('validation', 'Description exceeds maximum length')
+    tracker2.add_error('processing', 'Batch failed')
+    
+    tracker1.merge(tracker2)
+    summary = tracker1.get_summary()
+    
+    assert summary['counts'] == {'validation': 3, 'processing': 1}
+    assert len(summary['samples']['validation']) == 3
+    assert len(summary['samples']['processing']) == 1
+
+def test_error_tracker_merge_counts_unsampled_errors():
+    """Test merging counts unique errors beyond the sample limit."""
+    tracker1 = ErrorTracker(max_samples=1)
+    tracker1.add_error('validation', 'Error A')
+    
+    tracker2 = ErrorTracker(max_samples=1)
+    tracker2.add_error('validation', 'Error A')
+    tracker2.add_error('validation', 'Error B')  # Counted but not sampled
+    tracker2.add_error('validation', 'Error C')
+    
+    tracker1.merge(tracker2)
+    summary = tracker1.get_summary()
+    
+    assert summary['counts'] == {'validation': 3}
+    assert len(summary['samples']['validation']) == 1
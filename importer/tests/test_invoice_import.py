@@ -1,31 +1,80 @@
 """Integration tests for invoice import with full processing sequence."""
 
 import os
+import uuid
 from datetime import datetime
 import pandas as pd
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session
+import pytest
+from sqlalchemy import select
 
 from ..processors.invoice import InvoiceProcessor
 from ..processors.company import CompanyProcessor
+from ..processors.customer import CustomerProcessor
 from ..processors.product import ProductProcessor
-from ..utils import generate_uuid
 from ..db.models import (
     Customer, Company, Product,
-    Order, OrderStatus, PaymentStatus, OrderItem
+    Order, OrderStatus, PaymentStatus
 )
 
-def test_validate_data(session_manager):
-    """Test invoice data validation."""
-    processor = InvoiceProcessor(
+# Date format of invoice CSV dates
+_DATE_FMT = InvoiceProcessor.DATE_FORMAT
+
+def _parse_date(value):
+    """Parse a date string in invoice CSV format."""
+    return datetime.strptime(value, _DATE_FMT)
+
+# Namespace for deterministic IDs of seeded rows
+_TEST_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, 'py-importer-tests')
+
+def _tid(key):
+    """Get a deterministic test ID in UUID format for the given key."""
+    return str(uuid.uuid5(_TEST_NAMESPACE, key))
+
+# Invoice CSV row shared by the tests; each test overrides what it needs
+_BASE_INVOICE_ROW = {
+    'Invoice No': 'INV001',
+    'Invoice Date': '01-15-2025',
+    'Customer': 'Acme Corp',
+    'Terms': 'Net 30',
+    'Due Date': '02-14-2025',
+    'Status': 'Open',
+    'Product/Service': 'TEST001',
+    'Product/Service Description': 'Test product',
+    'Qty': '1',
+    'Product/Service  Amount': '100.00',
+    'Product/Service Sales Tax': '0.00'
+}
+
+# Company/customer and product rows for the full processing sequence;
+# copied before use so processors can't leak changes between tests
+_COMPANY_DF = pd.DataFrame({
+    'Customer Name': ['New Customer LLC'],
+    'QuickBooks Internal Id': ['QB-NEW001'],
+    'Main Email': ['contact@newcustomer.com']
+})
+_PRODUCT_DF = pd.DataFrame({
+    'Product/Service': ['NEW001'],
+    'Product/Service Description': ['New Product'],
+    'Product/Service  Amount': ['100.00']
+})
+
+@pytest.fixture
+def invoice_processor(engine):
+    """Create an invoice processor bound to the test database.
+    
+    Function-scoped so every test starts from fresh processor stats.
+    """
+    return InvoiceProcessor(
         config={'database_url': os.getenv('TEST_DATABASE_URL')},
         batch_size=100,
         error_limit=10
     )
-    
+
+def test_validate_data(invoice_processor):
+    """Test invoice data validation."""
     # Test missing required columns
     data1 = pd.DataFrame([{'Terms': 'Net 30'}])
-    critical1, warnings1 = processor.validate_data(data1)
+    critical1, warnings1 = invoice_processor.validate_data(data1)
     assert len(critical1) == 1  # Missing required columns
     
     # Test empty invoice numbers
@@ -33,7 +82,7 @@ def test_validate_data(session_manager):
         {'Invoice No': None, 'Invoice Date': '01-15-2025', 'Customer': 'Test'},
         {'Invoice No': 'INV001', 'Invoice Date': '01-15-2025', 'Customer': 'Test'}
     ])
-    critical2, warnings2 = processor.validate_data(data2)
+    critical2, warnings2 = invoice_processor.validate_data(data2)
     assert len(critical2) == 0
     assert len(warnings2) == 1  # Warning about empty invoice number
     
@@ -43,7 +92,7 @@ def test_validate_data(session_manager):
         'Invoice Date': 'invalid-date',
         'Customer': 'Test'
     }])
-    critical3, warnings3 = processor.validate_data(data3)
+    critical3, warnings3 = invoice_processor.validate_data(data3)
     assert len(critical3) == 0
     assert len(warnings3) == 1  # Warning about invalid date
 
@@ -57,41 +106,33 @@ def test_invoice_full_processing_sequence(session_manager):
     
     # Create test data
     data = pd.DataFrame([{
-        'Invoice No': 'INV001',
-        'Invoice Date': '01-15-2025',
+        **_BASE_INVOICE_ROW,
         'Customer': 'New Customer LLC',
-        'Terms': 'Net 30',
-        'Due Date': '02-14-2025',
-        'Status': 'Open',
         'Product/Service': 'NEW001',
-        'Product/Service Description': 'New Product',
-        'Qty': '1',
-        'Product/Service  Amount': '100.00',
-        'Product/Service Sales Tax': '0.00'
+        'Product/Service Description': 'New Product'
     }])
     
     # 1. Process companies
     company_processor = CompanyProcessor(config)
-    company_processor.process(pd.DataFrame([{
-        'Customer': 'New Customer LLC',
-        'Main Email': 'contact@newcustomer.com'
-    }]))
+    company_processor.process(_COMPANY_DF.copy())
     company_stats = company_processor.get_stats()
     assert company_stats['companies_created'] == 1
     
-    # 2. Process products
+    # 2. Process customers
+    customer_processor = CustomerProcessor(config)
+    customer_processor.process(_COMPANY_DF.copy())
+    customer_stats = customer_processor.get_stats()
+    assert customer_stats['customers_created'] == 1
+    
+    # 3. Process products
     product_processor = ProductProcessor(config)
-    product_processor.process(pd.DataFrame([{
-        'Product/Service': 'NEW001',
-        'Product/Service Description': 'New Product',
-        'Product/Service  Amount': '100.00'
-    }]))
+    product_processor.process(_PRODUCT_DF.copy())
     product_stats = product_processor.get_stats()
-    assert product_stats['products_created'] == 1
+    assert product_stats['created'] == 1
     
-    # 3. Process invoice
+    # 4. Process invoice
     invoice_processor = InvoiceProcessor(config)
-    result = invoice_processor.process(data)
+    invoice_processor.process(data)
     stats = invoice_processor.get_stats()
     
     # Verify results
@@ -99,143 +140,103 @@ def test_invoice_full_processing_sequence(session_manager):
     assert stats['created'] == 1
     assert stats['total_errors'] == 0
     
-    # Verify relationships
-    with Session(create_engine(os.getenv('TEST_DATABASE_URL'))) as session:
+    # Verify relationships from a fresh session that reads the committed rows
+    with session_manager() as verify_session:
         # Verify company was created
-        company = session.query(Company).filter_by(domain='newcustomer.com').first()
-        assert company is not None
+        company_domain = verify_session.scalar(
+            select(Company.domain).where(Company.domain == 'newcustomer.com')
+        )
+        assert company_domain is not None
         
         # Verify customer was created and linked to company
-        customer = session.query(Customer).filter_by(customerName='New Customer LLC').first()
+        customer = verify_session.execute(
+            select(Customer.id, Customer.companyDomain)
+            .where(Customer.customerName == 'New Customer LLC')
+        ).first()
         assert customer is not None
-        assert customer.company_domain == company.domain
+        assert customer.companyDomain == company_domain
         
         # Verify product was created
-        product = session.query(Product).filter_by(productCode='NEW001').first()
-        assert product is not None
-        assert product.description == 'New Product'
+        product_description = verify_session.scalar(
+            select(Product.description).where(Product.productCode == 'NEW001')
+        )
+        assert product_description == 'New Product'
         
         # Verify order was created and linked to customer
-        order = session.query(Order).filter_by(orderNumber='INV001').first()
-        assert order is not None
-        assert order.customerId == customer.id
+        order_customer_id = verify_session.scalar(
+            select(Order.customerId).where(Order.orderNumber == 'INV001')
+        )
+        assert order_customer_id == customer.id
 
-def test_invoice_import_exact_customer_match(session):
-    """Test invoice import with exact customer name match."""
-    # Create test customer
-    customer = Customer.create(
-        name='Acme Corp',
-        quickbooks_id='12345',
-        company_domain='example.com'
-    )
-    session.add(customer)
-    session.commit()
+@pytest.mark.parametrize("seed_name, csv_customer", [
+    ('Acme Corp', 'Acme Corp'),  # Exact match
+    ('ACME CORP', 'Acme Corporation'),  # Normalized business suffix
+    ('John Smith', 'Smith, John'),  # Comma-separated individual name
+    ('White Cap 30%:Whitecap Edmonton Canada', 'WHITE CAP 30%:WHITECAP EDMONTON CANADA'),  # Percentage notation
+])
+def test_invoice_import_customer_match(session_manager, invoice_processor, seed_name, csv_customer):
+    """Test invoice import matches existing customers by name."""
+    # Create test company and customer, committed so the processor sees them
+    with session_manager() as seed_session:
+        seed_session.add_all([
+            Company.create_from_domain('example.com'),
+            Customer.create(
+                name=seed_name,
+                quickbooks_id='12345',
+                company_domain='example.com'
+            )
+        ])
+        seed_session.commit()
     
     # Create test data
-    data = pd.DataFrame([{
-        'Invoice No': 'INV001',
-        'Invoice Date': '01-15-2025',
-        'Customer': 'Acme Corp',
-        'Terms': 'Net 30',
-        'Due Date': '02-14-2025',
-        'Status': 'Open',
-        'Product/Service': 'TEST001',
-        'Product/Service Description': 'Test product',
-        'Qty': '1',
-        'Product/Service  Amount': '100.00',
-        'Product/Service Sales Tax': '0.00'
-    }])
+    data = pd.DataFrame([{**_BASE_INVOICE_ROW, 'Customer': csv_customer}])
     
     # Process invoice
-    processor = InvoiceProcessor(
-        config={'database_url': str(session.get_bind().url)},
-        batch_size=100,
-        error_limit=10
-    )
-    result = processor.process(data)
-    stats = processor.get_stats()
-    
-    # Verify results
-    assert stats['total_invoices'] == 1
-    assert stats['created'] == 1
-    assert stats['total_errors'] == 0
-
-def test_invoice_import_normalized_customer_match(session):
-    """Test invoice import with normalized customer name match."""
-    # Create test customer
-    customer = Customer.create(
-        name='ACME CORPORATION',
-        quickbooks_id='12345',
-        company_domain='example.com'
-    )
-    session.add(customer)
-    session.commit()
-    
-    # Create test data
-    data = pd.DataFrame([{
-        'Invoice No': 'INV001',
-        'Invoice Date': '01-15-2025',
-        'Customer': 'Acme Corp LLC',  # Different format
-        'Terms': 'Net 30',
-        'Due Date': '02-14-2025',
-        'Status': 'Open',
-        'Product/Service': 'TEST001',
-        'Product/Service Description': 'Test product',
-        'Qty': '1',
-        'Product/Service  Amount': '100.00',
-        'Product/Service Sales Tax': '0.00'
-    }])
-    
-    # Process invoice
-    processor = InvoiceProcessor(
-        config={'database_url': str(session.get_bind().url)},
-        batch_size=100,
-        error_limit=10
-    )
-    result = processor.process(data)
-    stats = processor.get_stats()
+    invoice_processor.process(data)
+    stats = invoice_processor.get_stats()
     
     # Verify results
     assert stats['total_invoices'] == 1
     assert stats['created'] == 1
     assert stats['total_errors'] == 0
 
-def test_invoice_import_update_order(session):
+def test_invoice_import_update_order(session_manager, invoice_processor):
     """Test updating an existing order with changed data."""
-    # Create test customer
+    # Create test company and customer
+    company = Company.create_from_domain('example.com')
     customer = Customer.create(
         name='Acme Corp',
         quickbooks_id='12345',
         company_domain='example.com'
     )
-    session.add(customer)
     
     # Create initial order
     order = Order(
-        id=generate_uuid(),
+        id=_tid('order-INV001'),
         orderNumber='INV001',
         customerId=customer.id,
-        orderDate=datetime.strptime('01-15-2025', '%m-%d-%Y'),
+        orderDate=_parse_date('01-15-2025'),
         status=OrderStatus.OPEN,
         paymentStatus=PaymentStatus.UNPAID,
         subtotal=100.00,
         taxAmount=0.00,
         totalAmount=100.00,
         terms='Net 30',
-        class_='Retail'
+        class_='Retail',
+        createdAt=_parse_date('01-15-2025'),
+        modifiedAt=_parse_date('01-15-2025'),
+        sourceData={}
     )
-    session.add(order)
-    session.commit()
+    with session_manager() as seed_session:
+        seed_session.add_all([company, customer, order])
+        seed_session.commit()
     
     # Create test data with updates
     data = pd.DataFrame([{
-        'Invoice No': 'INV001',
-        'Invoice Date': '01-15-2025',
-        'Customer': 'Acme Corp',
+        **_BASE_INVOICE_ROW,
         'Terms': 'Net 15',  # Changed terms
         'Due Date': '01-30-2025',
         'Status': 'Paid',  # Changed status
-        'Product/Service': 'TEST001',
         'Product/Service Description': 'Updated product',
         'Qty': '2',
         'Product/Service  Amount': '200.00',
@@ -243,13 +244,8 @@ def test_invoice_import_update_order(session):
     }])
     
     # Process invoice
-    processor = InvoiceProcessor(
-        config={'database_url': str(session.get_bind().url)},
-        batch_size=100,
-        error_limit=10
-    )
-    result = processor.process(data)
-    stats = processor.get_stats()
+    invoice_processor.process(data)
+    stats = invoice_processor.get_stats()
     
     # Verify results
     assert stats['total_invoices'] == 1
@@ -257,35 +253,19 @@ def test_invoice_import_update_order(session):
     assert stats['created'] == 0
     
     # Verify order updates
-    updated_order = session.query(Order).filter_by(orderNumber='INV001').first()
-    assert updated_order.status == OrderStatus.CLOSED
-    assert updated_order.paymentStatus == PaymentStatus.PAID
-    assert updated_order.terms == 'Net 15'
+    with session_manager() as verify_session:
+        updated_order = verify_session.query(Order).filter_by(orderNumber='INV001').first()
+        assert updated_order.status == OrderStatus.CLOSED
+        assert updated_order.paymentStatus == PaymentStatus.PAID
+        assert updated_order.terms == 'Net 15'
 
-def test_invoice_import_customer_not_found(session):
+def test_invoice_import_customer_not_found(invoice_processor):
     """Test invoice import with non-existent customer."""
-    data = pd.DataFrame([{
-        'Invoice No': 'INV001',
-        'Invoice Date': '01-15-2025',
-        'Customer': 'Non Existent Corp',
-        'Terms': 'Net 30',
-        'Due Date': '02-14-2025',
-        'Status': 'Open',
-        'Product/Service': 'TEST001',
-        'Product/Service Description': 'Test product',
-        'Qty': '1',
-        'Product/Service  Amount': '100.00',
-        'Product/Service Sales Tax': '0.00'
-    }])
+    data = pd.DataFrame([{**_BASE_INVOICE_ROW, 'Customer': 'Non Existent Corp'}])
     
     # Process invoice
-    processor = InvoiceProcessor(
-        config={'database_url': str(session.get_bind().url)},
-        batch_size=100,
-        error_limit=10
-    )
-    result = processor.process(data)
-    stats = processor.get_stats()
+    invoice_processor.process(data)
+    stats = invoice_processor.get_stats()
     
     # Verify results
     assert stats['total_invoices'] == 0  # No invoices created
@@ -1,12 +1,15 @@
 """Integration tests for product processing phase."""
 
 import os
+from datetime import datetime
 import pandas as pd
+import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import Session
 
 from ..processors.product import ProductProcessor
 from ..db.models import Product
+from ..utils.bloom import ScalableBloomFilter
 
 def test_validate_data(session_manager):
     """Test product data validation."""
@@ -223,6 +226,141 @@ def test_product_batch_processing(session_manager):
     assert stats['successful_batches'] == 2  # Should be processed in 2 batches
     assert stats['total_errors'] == 0
 
+def test_product_repeated_index_labels(session_manager):
+    """Test validation keeps valid rows when the index repeats labels."""
+    processor = ProductProcessor(
+        config={'database_url': os.getenv('TEST_DATABASE_URL')},
+        batch_size=100,
+        error_limit=10
+    )
+    
+    # Concatenated frames give the index [0, 1, 0, 1]
+    data = pd.concat([
+        pd.DataFrame([
+            {'Product/Service': 'PROD1', 'Product/Service Description': 'Product 1'},
+            {'Product/Service': 'TEST-2', 'Product/Service Description': 'Test product'}
+        ]),
+        pd.DataFrame([
+            {'Product/Service': 'PROD3', 'Product/Service Description': 'Product 3'},
+            {'Product/Service': 'PROD4', 'Product/Service Description': 'Product 4'}
+        ])
+    ])
+    
+    # Process data
+    result = processor.process(data)
+    stats = processor.get_stats()
+    
+    # Verify only the test product was rejected
+    assert stats['created'] == 3
+    assert stats['validation_errors'] == 1
+    
+    with Session(create_engine(os.getenv('TEST_DATABASE_URL'))) as session:
+        codes = {product.productCode for product in session.query(Product).all()}
+        assert {'PROD1', 'PROD3', 'PROD4'} <= codes
+        assert 'TEST-2' not in codes
+
+def test_product_bloom_filter_dedup(session_manager, monkeypatch):
+    """Test dedup after processed codes move to a Bloom filter."""
+    # Switch to the Bloom filter once more than two codes are processed
+    monkeypatch.setattr(ProductProcessor, 'PROCESSED_CODES_LIMIT', 2)
+    processor = ProductProcessor(
+        config={'database_url': os.getenv('TEST_DATABASE_URL')},
+        batch_size=100,
+        error_limit=10
+    )
+    
+    processor.process(pd.DataFrame([
+        {'Product/Service': 'PROD1', 'Product/Service Description': 'Product 1'},
+        {'Product/Service': 'PROD2', 'Product/Service Description': 'Product 2'},
+        {'Product/Service': 'PROD3', 'Product/Service Description': 'Product 3'}
+    ]))
+    assert isinstance(processor.processed_codes, ScalableBloomFilter)
+    assert processor.get_stats()['created'] == 3
+    
+    # Simulate a false positive for a code that was never processed
+    processor.processed_codes.add('PROD9')
+    
+    processor.process(pd.DataFrame([
+        {'Product/Service': 'PROD1', 'Product/Service Description': 'Product 1'},
+        {'Product/Service': 'PROD9', 'Product/Service Description': 'Product 9'}
+    ]))
+    stats = processor.get_stats()
+    
+    # Processed code skipped, false positive still created
+    assert stats['created'] == 4
+    assert stats['skipped'] == 1
+    assert stats['total_products'] == 4
+    
+    with Session(create_engine(os.getenv('TEST_DATABASE_URL'))) as session:
+        product = session.query(Product).filter_by(productCode='PROD9').first()
+        assert product is not None
+        assert product.description == 'Product 9'
+
+def test_product_cache_skips_rolled_back_batch(session_manager, monkeypatch):
+    """Test the product cache only learns products from committed batches."""
+    processor = ProductProcessor(
+        config={'database_url': os.getenv('TEST_DATABASE_URL')},
+        batch_size=100,
+        error_limit=10
+    )
+    assert processor._product_cache is not None
+    
+    # Batch processing succeeds but the batch commit fails
+    real_commit = Session.commit
+    commits = []
+    def fail_first_commit(session):
+        commits.append(session)
+        if len(commits) == 1:
+            raise RuntimeError("commit failed")
+        real_commit(session)
+    monkeypatch.setattr(Session, 'commit', fail_first_commit)
+    
+    processor.process(pd.DataFrame([
+        {'Product/Service': 'PROD1', 'Product/Service Description': 'Product 1'}
+    ]))
+    stats = processor.get_stats()
+    monkeypatch.undo()
+    
+    # Failed batch rolled back without touching the cache
+    assert stats['failed_batches'] == 1
+    assert 'PROD1' not in processor._product_cache
+    
+    with Session(create_engine(os.getenv('TEST_DATABASE_URL'))) as session:
+        assert session.query(Product).filter_by(productCode='PROD1').first() is None
+
+def test_product_cache_dropped_on_conflict(session_manager):
+    """Test a product inserted by another session invalidates the cache."""
+    processor = ProductProcessor(
+        config={'database_url': os.getenv('TEST_DATABASE_URL')},
+        batch_size=100,
+        error_limit=10
+    )
+    assert processor._product_cache is not None
+    
+    # Insert a product the processor's cache has never seen
+    now = datetime.utcnow()
+    with Session(create_engine(os.getenv('TEST_DATABASE_URL'))) as session:
+        session.add(Product(
+            id='other-session-prod1',
+            productCode='PROD1',
+            name='PROD1',
+            description='Original Description',
+            createdAt=now,
+            modifiedAt=now
+        ))
+        session.commit()
+    
+    processor.process(pd.DataFrame([
+        {'Product/Service': 'PROD1', 'Product/Service Description': 'New Description'},
+        {'Product/Service': 'PROD2', 'Product/Service Description': 'Product 2'}
+    ]))
+    stats = processor.get_stats()
+    
+    # Conflicting insert skipped and the stale cache dropped
+    assert stats['created'] == 1
+    assert stats['skipped'] == 1
+    assert processor._product_cache is None
+
 def test_product_error_handling(session_manager):
     """Test error handling and validation."""
     processor = ProductProcessor(
@@ -284,3 +422,141 @@ def test_debug_logging(session_manager):
     assert 'db_operation_time' in stats
     assert stats['started_at'] is not None
     assert stats['completed_at'] is not None
+
+def test_process_file_streams_chunks(session_manager, tmp_path):
+    """Test process_file streams a CSV in batch-sized chunks."""
+    processor = ProductProcessor(
+        config={'database_url': os.getenv('TEST_DATABASE_URL')},
+        batch_size=2,  # Small batch size so the file spans several chunks
+        error_limit=10
+    )
+    
+    csv_path = tmp_path / 'products.csv'
+    csv_path.write_text(
+        'Product/Service,Product/Service Description\n'
+        'PROD1,Product 1\n'
+        'PROD2,Product 2\n'
+        'PROD3,Product 3\n'
+        'PROD4,Product 4\n'
+        'PROD5,Product 5\n'
+    )
+    
+    # Process file
+    result = processor.process_file(csv_path)
+    stats = result['summary']['stats']
+    
+    # Verify results
+    assert result['success']
+    assert stats['created'] == 5
+    assert stats['successful_batches'] == 3
+    assert stats['total_processed'] == 5
+
+def test_process_file_header_only(session_manager, tmp_path):
+    """Test process_file on a CSV with a header and no rows."""
+    processor = ProductProcessor(
+        config={'database_url': os.getenv('TEST_DATABASE_URL')},
+        batch_size=100,
+        error_limit=10
+    )
+    
+    csv_path = tmp_path / 'products.csv'
+    csv_path.write_text('Product/Service,Product/Service Description\n')
+    
+    # Process file
+    result = processor.process_file(csv_path)
+    stats = result['summary']['stats']
+    
+    # Verify nothing was processed
+    assert result['success']
+    assert stats['total_processed'] == 0
+    assert stats['created'] == 0
+
+def test_process_file_missing_product_column(session_manager, tmp_path):
+    """Test process_file rejects a CSV without a product code column."""
+    processor = ProductProcessor(
+        config={'database_url': os.getenv('TEST_DATABASE_URL')},
+        batch_size=100,
+        error_limit=10
+    )
+    
+    csv_path = tmp_path / 'products.csv'
+    csv_path.write_text('Customer,Qty\nAcme Corp,1\n')
+    
+    # Process file
+    result = processor.process_file(csv_path)
+    
+    # Verify the file was rejected before any rows were processed
+    assert not result['success']
+    assert 'Product/Service' in result['error']
+    assert result['summary']['stats']['total_processed'] == 0
+
+def test_process_file_ignores_extra_columns(session_manager, tmp_path):
+    """Test process_file only parses the mapped product columns."""
+    processor = ProductProcessor(
+        config={'database_url': os.getenv('TEST_DATABASE_URL')},
+        batch_size=100,
+        error_limit=10
+    )
+    
+    csv_path = tmp_path / 'products.csv'
+    csv_path.write_text(
+        'Customer,Product/Service,Qty,Product/Service Description\n'
+        'Acme Corp,PROD1,1,Product 1\n'
+    )
+    
+    # Verify the reader drops unmapped columns
+    chunk = next(processor._open_reader(csv_path))
+    assert list(chunk.columns) == ['Product/Service', 'Product/Service Description']
+    
+    # Process file
+    result = processor.process_file(csv_path)
+    stats = result['summary']['stats']
+    
+    # Verify results
+    assert result['success']
+    assert stats['created'] == 1
+    
+    with Session(create_engine(os.getenv('TEST_DATABASE_URL'))) as session:
+        product = session.query(Product).filter_by(productCode='PROD1').first()
+        assert product.description == 'Product 1'
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_process_file_parallel_matches_sequential(session_manager, tmp_path, max_workers):
+    """Test process_file gives the same totals with one or several workers."""
+    processor = ProductProcessor(
+        config={'database_url': os.getenv('TEST_DATABASE_URL')},
+        batch_size=2,
+        error_limit=10,
+        max_workers=max_workers
+    )
+    
+    # Duplicates across chunks, and the same validation error in both shards
+    csv_path = tmp_path / 'products.csv'
+    csv_path.write_text(
+        'Product/Service,Product/Service Description\n'
+        'PROD1,Product 1\n'
+        'PROD2,Product 2\n'
+        'BAD 1,Invalid code\n'
+        'PROD3,Product 3\n'
+        'prod1,Product 1\n'
+        'PROD4,Product 4\n'
+        'TEST-1,Test product\n'
+        'BAD 4,Invalid code\n'
+        'PROD5,Product 5\n'
+        'PROD2,Product 2\n'
+        'PROD6,Product 6\n'
+    )
+    
+    # Process file
+    result = processor.process_file(csv_path)
+    stats = result['summary']['stats']
+    
+    # Verify the same totals as a sequential run
+    assert result['success']
+    assert stats['created'] == 6
+    assert stats['skipped'] == 2
+    assert stats['validation_errors'] == 3
+    assert stats['total_processed'] == 11
+    
+    # Unique errors are counted once even when several workers hit them
+    assert result['summary']['errors']['counts'] == {'validation': 2}
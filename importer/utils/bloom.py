@@ -0,0 +1,81 @@
+"""Bloom filter utilities for memory-bounded membership tracking."""
+
+import hashlib
+import math
+from typing import Iterable, List
+
+class BloomFilter:
+    """Fixed-capacity Bloom filter for strings.
+
+    Membership checks may return false positives at roughly error_rate once
+    the filter holds capacity items, but never false negatives.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        """Initialize an empty filter.
+
+        Args:
+            capacity: Number of items the filter is sized for
+            error_rate: Target false positive rate at capacity
+        """
+        self.capacity = capacity
+        self.count = 0
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, item: str) -> Iterable[int]:
+        """Get the bit positions for an item (double hashing over one digest)."""
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, item: str) -> None:
+        """Add an item to the filter."""
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        """Check whether an item may have been added."""
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+class ScalableBloomFilter:
+    """Bloom filter that grows by adding larger filters as it fills.
+
+    Each added filter doubles in capacity and halves its error rate, so the
+    overall false positive rate stays below error_rate.
+    """
+
+    def __init__(self, initial_capacity: int = 1_000_000, error_rate: float = 0.001):
+        """Initialize an empty filter.
+
+        Args:
+            initial_capacity: Capacity of the first filter
+            error_rate: Target overall false positive rate
+        """
+        self.error_rate = error_rate
+        self.filters: List[BloomFilter] = [BloomFilter(initial_capacity, error_rate / 2)]
+
+    def add(self, item: str) -> None:
+        """Add an item to the filter."""
+        if item in self:
+            return
+        current = self.filters[-1]
+        if current.count >= current.capacity:
+            current = BloomFilter(
+                current.capacity * 2,
+                self.error_rate / 2 ** (len(self.filters) + 1)
+            )
+            self.filters.append(current)
+        current.add(item)
+
+    def update(self, items: Iterable[str]) -> None:
+        """Add several items to the filter."""
+        for item in items:
+            self.add(item)
+
+    def __contains__(self, item: str) -> bool:
+        """Check whether an item may have been added."""
+        return any(item in bloom for bloom in self.filters)
@@ -1,7 +1,7 @@
 """System product utilities."""
 
 from datetime import datetime
-from typing import List, Tuple
+from typing import List, Set, Tuple
 
 from ..db.models import Product
 from ..utils import generate_uuid
@@ -14,6 +14,12 @@ SYSTEM_PRODUCTS: List[Tuple[str, str, str]] = [
     ('SYS-DISCOUNT', 'Discount', 'System product for discounts')
 ]
 
+# All system product codes, for constant-time membership checks
+SYSTEM_PRODUCT_CODES = frozenset(code for code, _, _ in SYSTEM_PRODUCTS)
+
+# Databases whose system products were initialized by this process
+_initialized_databases: Set[str] = set()
+
 # Product type constants
 SHIPPING_CODES = ['SYS-SHIPPING']
 TAX_CODES = ['SYS-TAX', 'SYS-NJ-TAX']
@@ -51,6 +57,22 @@ def initialize_system_products(session) -> List[Product]:
     session.commit()
     return products
 
+def ensure_system_products(session, database_url: str) -> None:
+    """Initialize system products once per database per process.
+    
+    Args:
+        session: Database session
+        database_url: URL of the database the session is bound to
+    """
+    if database_url in _initialized_databases:
+        return
+    initialize_system_products(session)
+    _initialized_databases.add(database_url)
+
+def reset_system_products_state() -> None:
+    """Forget which databases were initialized (e.g. after truncating tables)."""
+    _initialized_databases.clear()
+
 def is_system_product(product_code: str) -> bool:
     """Check if a product code is a system product.
     
@@ -60,7 +82,7 @@ def is_system_product(product_code: str) -> bool:
     Returns:
         True if product code is a system product
     """
-    return any(code for code, _, _ in SYSTEM_PRODUCTS if code == product_code)
+    return product_code in SYSTEM_PRODUCT_CODES
 
 def is_shipping_product(product_code: str) -> bool:
     """Check if a product code is a shipping product.